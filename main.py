@@ -1,4 +1,3 @@
-import copy
 import json
 import logging
 import os
@@ -355,7 +354,9 @@ def get_default_corner_config(corner):
 
 
 def merge_corner_config(default_corner, override):
-    result = copy.deepcopy(default_corner)
+    result = dict(default_corner)
+    if isinstance(result.get("label"), dict):
+        result["label"] = dict(result["label"])
     if not override:
         return result
 
@@ -581,8 +582,10 @@ def config():
         }
 
         kort_all = {}
+        current_kort_all = current_config["kort_all"]
         for corner in CORNERS:
-            existing_corner = current_config["kort_all"].get(corner, get_default_corner_config(corner))
+            existing_corner = current_kort_all.get(corner, get_default_corner_config(corner))
+            existing_label = existing_corner["label"]
             prefix = f"kort_all[{corner}]"
             label_prefix = f"{prefix}[label]"
 
@@ -593,9 +596,9 @@ def config():
                 "offset_x": as_int(form.get(f"{prefix}[offset_x]", existing_corner["offset_x"]), existing_corner["offset_x"]),
                 "offset_y": as_int(form.get(f"{prefix}[offset_y]", existing_corner["offset_y"]), existing_corner["offset_y"]),
                 "label": {
-                    "position": form.get(f"{label_prefix}[position]", existing_corner["label"]["position"]),
-                    "offset_x": as_int(form.get(f"{label_prefix}[offset_x]", existing_corner["label"]["offset_x"]), existing_corner["label"]["offset_x"]),
-                    "offset_y": as_int(form.get(f"{label_prefix}[offset_y]", existing_corner["label"]["offset_y"]), existing_corner["label"]["offset_y"]),
+                    "position": form.get(f"{label_prefix}[position]", existing_label["position"]),
+                    "offset_x": as_int(form.get(f"{label_prefix}[offset_x]", existing_label["offset_x"]), existing_label["offset_x"]),
+                    "offset_y": as_int(form.get(f"{label_prefix}[offset_y]", existing_label["offset_y"]), existing_label["offset_y"]),
                 },
             }
 
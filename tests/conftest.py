@@ -1,33 +1,53 @@
 import base64
+import os
+import shutil
+import tempfile
+from pathlib import Path
 
 import pytest
 
-from main import app, db
+# Silnik bazy jest tworzony przy imporcie `main`, więc testową bazę
+# wskazujemy przez DATABASE_URL zanim moduł zostanie zaimportowany.
+TEST_DATABASE_DIR = Path(tempfile.mkdtemp(prefix="overlay-tests-"))
+TEST_DATABASE_URI = f"sqlite:///{TEST_DATABASE_DIR / 'overlay.sqlite'}"
+os.environ["DATABASE_URL"] = TEST_DATABASE_URI
 
+from main import app, db  # noqa: E402
 
-@pytest.fixture
-def auth_headers(monkeypatch):
-    username = "test-user"
-    password = "test-pass"
-    monkeypatch.setenv("CONFIG_AUTH_USERNAME", username)
-    monkeypatch.setenv("CONFIG_AUTH_PASSWORD", password)
-    token = base64.b64encode(f"{username}:{password}".encode()).decode()
-    return {"Authorization": f"Basic {token}"}
+
+AUTH_USERNAME = "test-user"
+AUTH_PASSWORD = "test-pass"
+AUTH_TOKEN = base64.b64encode(f"{AUTH_USERNAME}:{AUTH_PASSWORD}".encode()).decode()
+
+
+@pytest.fixture(scope="session")
+def basic_auth_headers():
+    return {"Authorization": f"Basic {AUTH_TOKEN}"}
 
 
 @pytest.fixture
+def auth_headers(monkeypatch, basic_auth_headers):
+    monkeypatch.setenv("CONFIG_AUTH_USERNAME", AUTH_USERNAME)
+    monkeypatch.setenv("CONFIG_AUTH_PASSWORD", AUTH_PASSWORD)
+    return basic_auth_headers
+
+
+@pytest.fixture(scope="session")
 def client():
     app.config.update(TESTING=True)
-    with app.test_client() as client:
-        yield client
+    return app.test_client()
 
 
-@pytest.fixture(autouse=True)
-def restore_config_file(tmp_path):
-    database_path = tmp_path / "overlay.sqlite"
-    app.config.update(SQLALCHEMY_DATABASE_URI=f"sqlite:///{database_path}")
+@pytest.fixture(scope="session")
+def database_uri():
+    yield TEST_DATABASE_URI
+    shutil.rmtree(TEST_DATABASE_DIR, ignore_errors=True)
 
+
+@pytest.fixture(scope="session")
+def database_schema(database_uri):
     with app.app_context():
+        assert db.engine.url.render_as_string() == database_uri
         db.session.remove()
         db.engine.dispose()
         db.drop_all()
@@ -39,3 +59,20 @@ def restore_config_file(tmp_path):
         db.session.remove()
         db.drop_all()
         db.engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def reset_database(database_schema):
+    def reset():
+        with app.app_context():
+            db.session.remove()
+            for table in reversed(db.metadata.sorted_tables):
+                db.session.execute(table.delete())
+            db.session.commit()
+
+    return reset
+
+
+@pytest.fixture(autouse=True)
+def restore_config_file(reset_database):
+    reset_database()
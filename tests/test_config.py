@@ -1,3 +1,5 @@
+import re
+
 import pytest
 from bs4 import BeautifulSoup
 
@@ -7,19 +9,45 @@ from main import (
     CORNER_POSITION_STYLES,
     app,
     as_float,
+    db,
+    get_default_corner_config,
     load_config,
+    merge_corner_config,
     render_config,
     save_config,
     OverlayConfig,
 )
 
 
-@pytest.fixture
-def authorized_client(client, auth_headers):
-    client.environ_base["HTTP_AUTHORIZATION"] = auth_headers["Authorization"]
+DATA_CORNER_PATTERN = re.compile(r'data-corner="(\w+)"')
+
+
+def rendered_corners(html):
+    return set(DATA_CORNER_PATTERN.findall(html))
+
+
+def extract_px_value(style_text, property_name):
+    for declaration in style_text.split(";"):
+        name, _, value = declaration.partition(":")
+        if name.strip() == property_name:
+            cleaned = value.strip().removesuffix("px")
+            return float(cleaned)
+    return None
+
+
+@pytest.fixture(scope="module")
+def authorized_test_client(basic_auth_headers):
+    app.config.update(TESTING=True)
+    client = app.test_client()
+    client.environ_base["HTTP_AUTHORIZATION"] = basic_auth_headers["Authorization"]
     return client
 
 
+@pytest.fixture
+def authorized_client(authorized_test_client, auth_headers):
+    return authorized_test_client
+
+
 def test_get_config_renders_form_and_preview(authorized_client):
     response = authorized_client.get("/config")
 
@@ -52,7 +80,7 @@ def test_post_config_updates_overlay_file(authorized_client):
         "kort_all[bottom_right][label][position]": "top-right",
     }
 
-    response = authorized_client.post("/config", data=payload, follow_redirects=True)
+    response = authorized_client.post("/config", data=payload)
 
     assert response.status_code == 200
     html = response.get_data(as_text=True)
@@ -60,8 +88,7 @@ def test_post_config_updates_overlay_file(authorized_client):
     assert 'option value="bottom-right" selected' in html
 
     with app.app_context():
-        stored = OverlayConfig.query.first()
-        assert stored is not None
+        stored = db.session.execute(db.select(OverlayConfig)).scalar_one()
         written = stored.to_dict()
 
     assert written["view_width"] == 720
@@ -86,12 +113,14 @@ def test_post_config_updates_overlay_file(authorized_client):
         "display_scale": "1,25",
     }
 
-    response = authorized_client.post("/config", data=comma_payload, follow_redirects=True)
+    response = authorized_client.post("/config", data=comma_payload)
 
     assert response.status_code == 200
 
     with app.app_context():
-        written = OverlayConfig.query.first().to_dict()
+        db.session.add(stored)
+        db.session.refresh(stored)
+        written = stored.to_dict()
     assert written["display_scale"] == pytest.approx(1.25)
 
 
@@ -101,7 +130,7 @@ def test_post_config_accepts_comma_decimal_values(authorized_client):
         "kort_all[top_left][display_scale]": " 1,35 ",
     }
 
-    response = authorized_client.post("/config", data=payload, follow_redirects=True)
+    response = authorized_client.post("/config", data=payload)
 
     assert response.status_code == 200
 
@@ -121,25 +150,17 @@ def test_config_preview_uses_comma_decimal_values_in_styles(authorized_client):
         "kort_all[top_left][display_scale]": " 1,25 ",
     }
 
-    response = authorized_client.post("/config", data=payload, follow_redirects=True)
+    response = authorized_client.post("/config", data=payload)
 
     assert response.status_code == 200
 
-    soup = BeautifulSoup(response.get_data(as_text=True), "html.parser")
+    soup = BeautifulSoup(response.data, "html.parser")
     card = soup.select_one('[data-preview-stage="all"] [data-corner="top_left"]')
     assert card is not None
 
     style = card.get("style", "")
     assert "width" in style and "height" in style
 
-    def extract_px_value(style_text, property_name):
-        for declaration in style_text.split(";"):
-            name, _, value = declaration.partition(":")
-            if name.strip() == property_name:
-                cleaned = value.strip().removesuffix("px")
-                return float(cleaned)
-        return None
-
     width_px = extract_px_value(style, "width")
     height_px = extract_px_value(style, "height")
 
@@ -150,7 +171,7 @@ def test_config_preview_uses_comma_decimal_values_in_styles(authorized_client):
     overlay_response = authorized_client.get("/kort/all")
     assert overlay_response.status_code == 200
 
-    overlay_soup = BeautifulSoup(overlay_response.get_data(as_text=True), "html.parser")
+    overlay_soup = BeautifulSoup(overlay_response.data, "html.parser")
     top_left_container = overlay_soup.select_one('[data-position="top-left"]')
     assert top_left_container is not None
 
@@ -167,10 +188,40 @@ def test_config_preview_uses_comma_decimal_values_in_styles(authorized_client):
     assert "scale(1.25)" in iframe_style
 
 
-def test_as_float_supports_dot_and_comma_decimal_separators():
-    assert as_float("1.25", 0.0) == pytest.approx(1.25)
-    assert as_float("1,25", 0.0) == pytest.approx(1.25)
-    assert as_float(" 1,25 ", 0.0) == pytest.approx(1.25)
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("1.25", 1.25),
+        ("1,25", 1.25),
+        (" 1,25 ", 1.25),
+        (2, 2.0),
+    ],
+)
+def test_as_float_supports_dot_and_comma_decimal_separators(value, expected):
+    assert as_float(value, 0.0) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("value", ["", "abc", None])
+def test_as_float_falls_back_to_default(value):
+    assert as_float(value, 0.5) == pytest.approx(0.5)
+
+
+def test_merge_corner_config_leaves_default_corner_untouched():
+    default_corner = get_default_corner_config("top_right")
+    expected = get_default_corner_config("top_right")
+
+    merged = merge_corner_config(
+        default_corner,
+        {"offset_x": 40, "label": {"position": "bottom-left", "offset_y": None}},
+    )
+
+    assert default_corner == expected
+    assert merged["offset_x"] == 40
+    assert merged["label"] == {
+        "position": "bottom-left",
+        "offset_x": expected["label"]["offset_x"],
+        "offset_y": expected["label"]["offset_y"],
+    }
 
 
 def test_kort_route_uses_overlay_configuration(client):
@@ -227,59 +278,30 @@ def test_config_template_renders_with_full_context():
         html = render_config(config)
 
     assert "Konfiguracja Overlay" in html
-    for corner in CORNERS:
-        assert f'data-corner="{corner}"' in html
-
-
-def test_config_template_handles_missing_corner_labels():
-    config = load_config()
-
-    with app.app_context():
-        template = app.jinja_env.get_template("config.html")
-        html = template.render(
-            config=config,
-            corners=CORNERS,
-            corner_positions=CORNER_POSITION_STYLES,
-        )
-
-    assert "Konfiguracja Overlay" in html
-    for corner in CORNERS:
-        assert f'data-corner="{corner}"' in html
-
-
-def test_config_template_handles_absent_corner_positions_context():
-    config = load_config()
-
-    with app.app_context():
-        template = app.jinja_env.get_template("config.html")
-        html = template.render(
-            config=config,
-            corners=CORNERS,
-            corner_labels=CORNER_LABELS,
-        )
-
-    assert "Konfiguracja Overlay" in html
-    for corner in CORNERS:
-        assert f'data-corner="{corner}"' in html
-    assert "width:" in html and "height:" in html
+    assert set(CORNERS) <= rendered_corners(html)
 
 
-def test_config_template_handles_missing_corner_position_entries():
+@pytest.mark.parametrize(
+    "context",
+    [
+        {"corner_positions": CORNER_POSITION_STYLES},
+        {"corner_labels": CORNER_LABELS},
+        {
+            "corner_labels": CORNER_LABELS,
+            "corner_positions": {"top_left": CORNER_POSITION_STYLES["top_left"]},
+        },
+    ],
+    ids=["missing_corner_labels", "absent_corner_positions", "partial_corner_positions"],
+)
+def test_config_template_handles_partial_context(context):
     config = load_config()
-    partial_positions = {"top_left": CORNER_POSITION_STYLES["top_left"]}
 
     with app.app_context():
         template = app.jinja_env.get_template("config.html")
-        html = template.render(
-            config=config,
-            corners=CORNERS,
-            corner_labels=CORNER_LABELS,
-            corner_positions=partial_positions,
-        )
+        html = template.render(config=config, corners=CORNERS, **context)
 
     assert "Konfiguracja Overlay" in html
-    for corner in CORNERS:
-        assert f'data-corner="{corner}"' in html
+    assert set(CORNERS) <= rendered_corners(html)
     assert "width:" in html and "height:" in html
 
 
@@ -4,6 +4,12 @@ from flask import render_template
 from main import app as flask_app
 
 
+def create_overlay_link(client, payload):
+    response = client.post("/api/overlay-links", json=payload)
+    assert response.status_code == 201
+    return response.get_json()
+
+
 @pytest.mark.parametrize("kort_id", [1, 2])
 def test_overlay_kort_existing(client, kort_id):
     response = client.get(f"/kort/{kort_id}")
@@ -17,15 +23,14 @@ def test_overlay_kort_existing(client, kort_id):
 def test_overlay_all_view(client):
     response = client.get("/kort/all")
     assert response.status_code == 200
-    html = response.data.decode()
-    assert "class=\"stage\"" in html or "class=\"stage\"".replace('"', '&quot;') in html
-    assert html.count("kort-frame") >= 1
-    assert "Kort 1" in html and "Kort 4" in html
+    html = response.data
+    assert b'class="stage"' in html or b"class=&quot;stage&quot;" in html
+    assert b"kort-frame" in html
+    assert b"Kort 1" in html and b"Kort 4" in html
 
 
 def test_overlay_all_route_registered():
-    rules = [rule.rule for rule in flask_app.url_map.iter_rules("overlay_all")]
-    assert "/kort/all" in rules
+    assert any(rule.rule == "/kort/all" for rule in flask_app.url_map.iter_rules("overlay_all"))
 
 
 def test_overlay_kort_not_found(client):
@@ -34,12 +39,9 @@ def test_overlay_kort_not_found(client):
     assert "Nieznany kort" in response.get_data(as_text=True)
 
 
-def test_overlay_all_and_non_numeric_kort(client):
-    all_response = client.get("/kort/all")
-    assert all_response.status_code == 200
-
-    non_numeric_response = client.get("/kort/not-a-number")
-    assert non_numeric_response.status_code == 404
+def test_overlay_kort_non_numeric_id_not_found(client):
+    response = client.get("/kort/not-a-number")
+    assert response.status_code == 404
 
 
 def test_config_page_renders(client, auth_headers):
@@ -61,9 +63,7 @@ def test_overlay_links_api_create_and_list(client):
         "overlay": "https://example.com/overlay",
         "control": "https://example.com/control",
     }
-    response = client.post("/api/overlay-links", json=payload)
-    assert response.status_code == 201
-    created = response.get_json()
+    created = create_overlay_link(client, payload)
     assert created["kort_id"] == payload["kort_id"]
 
     list_response = client.get("/api/overlay-links")
@@ -72,14 +72,35 @@ def test_overlay_links_api_create_and_list(client):
     assert any(link["kort_id"] == payload["kort_id"] for link in links)
 
 
+@pytest.mark.parametrize(
+    ("override", "field", "expected"),
+    [
+        ({"kort_id": "  "}, "kort_id", "ID kortu jest wymagane."),
+        ({"overlay": "ftp://example.com/overlay"}, "overlay", "Niepoprawny adres URL overlayu."),
+        ({"overlay": "https:///overlay"}, "overlay", "Niepoprawny adres URL overlayu."),
+        ({"control": "example.com/control"}, "control", "Niepoprawny adres URL panelu sterowania."),
+    ],
+    ids=["missing_kort_id", "overlay_scheme", "overlay_host", "control_scheme"],
+)
+def test_overlay_links_api_rejects_invalid_payload(client, override, field, expected):
+    payload = {
+        "kort_id": "42",
+        "overlay": "https://example.com/overlay-42",
+        "control": "https://example.com/control-42",
+        **override,
+    }
+    response = client.post("/api/overlay-links", json=payload)
+    assert response.status_code == 400
+    assert response.get_json()["errors"] == {field: expected}
+
+
 def test_index_renders_links_from_database(client):
     new_link = {
         "kort_id": "77",
         "overlay": "https://example.com/new-overlay",
         "control": "https://example.com/new-control",
     }
-    post_response = client.post("/api/overlay-links", json=new_link)
-    assert post_response.status_code == 201
+    create_overlay_link(client, new_link)
 
     response = client.get("/")
     assert response.status_code == 200
@@ -94,8 +115,7 @@ def test_overlay_kort_uses_new_link(client):
         "overlay": "https://example.com/overlay-55",
         "control": "https://example.com/control-55",
     }
-    create_response = client.post("/api/overlay-links", json=new_link)
-    assert create_response.status_code == 201
+    create_overlay_link(client, new_link)
 
     response = client.get("/kort/55")
     assert response.status_code == 200